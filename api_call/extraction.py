@@ -1,74 +1,103 @@
-import json
+import orjson
 import logging
 import os
-os.makedirs("logs", exist_ok=True)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOG_DIR = os.path.join(BASE_DIR, 'logs')
+os.makedirs(LOG_DIR, exist_ok=True)
 
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('logs/extraction.log', encoding='utf-8'),
+        logging.FileHandler(os.path.join(LOG_DIR, 'extraction.log'), encoding='utf-8'),
         logging.StreamHandler()
     ]
 )
 
 logger = logging.getLogger(__name__)
-def extract_auth_token_object(json_file_path):
+
+SESSION_STORAGE_FILE = os.path.join(BASE_DIR, 'auth_data', 'session_storage.json')
+TOKEN_DIR = os.path.join(BASE_DIR, 'assests')
+TOKEN_FILE = os.path.join(TOKEN_DIR, 'token.json')
+
+def _read_json(path):
+    """Read a JSON file with orjson"""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+def _write_json(path, obj):
+    """Write an indented JSON file with orjson"""
+    with open(path, 'wb') as f:
+        f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+
+_session_cache = {}
+
+def load_session_storage(json_file_path):
     """
-    Read JSON file and extract authTokenObject
+    Read the session storage JSON file once and cache the parsed data
+    """
+    data = _session_cache.get(json_file_path)
+    if data is not None:
+        return data
+    
+    try:
+        data = _read_json(json_file_path)
+    except FileNotFoundError:
+        print(f"File {json_file_path} not found")
+        return {}
+    except orjson.JSONDecodeError as e:
+        print(f"Error parsing JSON: {e}")
+        return {}
+    except Exception as e:
+        print(f"Error: {e}")
+        return {}
+    
+    _session_cache[json_file_path] = data
+    return data
+
+def extract_auth_token_object(data):
+    """
+    Extract authTokenObject from parsed session storage data
     """
     try:
-        # Read the JSON file
-        with open(json_file_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-        
         # Get the authTokenObject (it's a JSON string)
         auth_token_string = data.get('authTokenObject')
         logging.info(f"auth token is {auth_token_string}")
         
         if auth_token_string:
             # Parse the JSON string to get the actual object
-            auth_token_object = json.loads(auth_token_string)
+            auth_token_object = orjson.loads(auth_token_string)
             return auth_token_object
         else:
             print("authTokenObject not found in the JSON file")
             return None
             
-    except FileNotFoundError:
-        print(f"File {json_file_path} not found")
-        return None
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"Error parsing JSON: {e}")
         return None
     except Exception as e:
         print(f"Error: {e}")
         return None
 
-def extract_membership_token(json_file_path):
+def extract_membership_token(data):
     """
-    Read JSON file and extract authTokenObject
+    Extract livingObject from parsed session storage data
     """
     try:
-        # Read the JSON file
-        with open(json_file_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-        
-        # Get the authTokenObject (it's a JSON string)
+        # Get the livingObject (it's a JSON string)
         living_token_string = data.get('livingObject')
         logging.info(f"memebrship token is {living_token_string}")
         
         if living_token_string:
             # Parse the JSON string to get the actual object
-            living_token_object = json.loads(living_token_string)
+            living_token_object = orjson.loads(living_token_string)
             return living_token_object
         else:
-            print("authTokenObject not found in the JSON file")
+            print("livingObject not found in the JSON file")
             return None
             
-    except FileNotFoundError:
-        print(f"File {json_file_path} not found")
-        return None
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"Error parsing JSON: {e}")
         return None
     except Exception as e:
@@ -76,52 +105,55 @@ def extract_membership_token(json_file_path):
         return None
     
 
-def extract_party_access_token(json_file_path):
+def extract_party_access_token(data):
     """
-    Extract only the partyAccessToken from JSON file
+    Extract only the partyAccessToken from parsed session storage data
     """
-    with open(json_file_path, 'r', encoding='utf-8') as file:
-        data = json.load(file)
-    
     return data.get('partyAccessToken')
 
 
-# Usage
-json_file_path = r'auth_data\session_storage.json' 
-auth_token_obj = extract_auth_token_object(json_file_path)
-living_token_object = extract_membership_token(json_file_path)
-party_token_obj = extract_party_access_token(json_file_path)
+def main():
+    """Extract tokens from the saved session storage and write them to token.json"""
+    session_data = load_session_storage(SESSION_STORAGE_FILE)
+    if not session_data:
+        # Keep the existing token.json instead of overwriting it with empty tokens
+        print("No session storage data, token.json left unchanged")
+        return
 
-# Extract tokens
-access_token = None
-domain = None
-membership_token = None
+    auth_token_obj = extract_auth_token_object(session_data)
+    living_token_object = extract_membership_token(session_data)
+    party_token_obj = extract_party_access_token(session_data)
 
+    # Extract tokens
+    access_token = None
+    domain = None
+    membership_token = None
 
-if auth_token_obj:
-    access_token = auth_token_obj.get('access_token')
-    domain = auth_token_obj.get('domain')
+    if auth_token_obj:
+        access_token = auth_token_obj.get('access_token')
+        domain = auth_token_obj.get('domain')
 
-if living_token_object:
-    membership_token = living_token_object.get('memberProfileToken')
-    if not membership_token:
-        membership_token = living_token_object.get('login-memberProfileToken')
+    if living_token_object:
+        membership_token = living_token_object.get('memberProfileToken')
+        if not membership_token:
+            membership_token = living_token_object.get('login-memberProfileToken')
 
-if party_token_obj:
-    print(f"party token object {party_token_obj}")
+    if party_token_obj:
+        print(f"party token object {party_token_obj}")
 
-# Prepare token data
-tokens = {
-    "access_token": access_token,
-    "domain": domain,
-    "membership_profile_token": membership_token,
-    "party_token": party_token_obj
-}
+    # Prepare token data
+    tokens = {
+        "access_token": access_token,
+        "domain": domain,
+        "membership_profile_token": membership_token,
+        "party_token": party_token_obj
+    }
 
-# Save to token.json in assests folder
-os.makedirs(r'assests', exist_ok=True)
-with open(r'assests\token.json', 'w', encoding='utf-8') as f:
-    json.dump(tokens, f, indent=2)
+    # Save to token.json in assests folder
+    os.makedirs(TOKEN_DIR, exist_ok=True)
+    _write_json(TOKEN_FILE, tokens)
 
-print("Tokens extracted and saved to token.json")
+    print("Tokens extracted and saved to token.json")
 
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,103 @@
-import requests
-import json
+import asyncio
+import csv
+import functools
+import hashlib
+import httpx
+import orjson
 import pandas as pd
-from datetime import datetime
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from aiolimiter import AsyncLimiter
+from datetime import datetime, timezone
 import os
 import logging
 import time
 
+try:
+    import uvloop
+except ImportError:
+    # uvloop is not available on Windows; fall back to the default asyncio loop
+    uvloop = None
+
+# Every path below is anchored to the repo root so the script runs from any working directory
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOG_DIR = os.path.join(BASE_DIR, 'logs')
+
 # Setup logging
-os.makedirs("logs", exist_ok=True)
+os.makedirs(LOG_DIR, exist_ok=True)
+# Per-request INFO lines go to the log file only; the console shows warnings and errors
+console_handler = logging.StreamHandler()
+console_handler.setLevel(logging.WARNING)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('logs/api_fetch.log', encoding='utf-8'),
-        logging.StreamHandler()
+        logging.FileHandler(os.path.join(LOG_DIR, 'api_fetch.log'), encoding='utf-8'),
+        console_handler
     ]
 )
 logger = logging.getLogger(__name__)
 
+TOKEN_FILE = os.path.join(BASE_DIR, 'assests', 'token.json')
+RESORT_MAPPING_FILE = os.path.join(BASE_DIR, 'assests', 'final_MASTER_merged_ssms_with_tzort_mapping.csv')
+ORDERS_FILE = os.path.join(BASE_DIR, 'csvs', 'all_resorts_detailed_orders.csv')
+
+# Only the order columns we use, with known dtypes so the reader skips type inference
+ORDERS_USECOLS = ['ResortId', 'Resort', 'Arrival', 'Departure', 'MinUnits']
+ORDERS_DTYPES = {'ResortId': 'int32', 'Resort': 'string', 'MinUnits': 'int32'}
+ORDERS_DATE_COLUMNS = ['Arrival', 'Departure']
+
+def _read_json(path):
+    """Read a JSON file with orjson"""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+def _write_json(path, obj, indent=True):
+    """Write a JSON file with orjson, indented unless indent is False"""
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    with open(path, 'wb') as f:
+        f.write(orjson.dumps(obj, option=option))
+
+@functools.lru_cache(maxsize=4)
+def _read_resort_mapping(path, mtime):
+    """Map ResortId to Wyndham resort id, cached per file path and modification time"""
+    # Use the first row seen per ResortId
+    mapping_dict = {}
+    seen_resort_ids = set()
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            resort_id = int(float(row['ResortId']))
+            if resort_id in seen_resort_ids:
+                continue
+            seen_resort_ids.add(resort_id)
+            
+            wyndham_id = row['resort id in wyndham onwner site'].strip()
+            if wyndham_id:
+                mapping_dict[resort_id] = float(wyndham_id)
+    return mapping_dict
+
+@functools.lru_cache(maxsize=4)
+def _read_orders_csv(path, mtime):
+    """Read the orders CSV, cached per file path and modification time"""
+    return pd.read_csv(
+        path,
+        usecols=ORDERS_USECOLS,
+        dtype=ORDERS_DTYPES,
+        parse_dates=ORDERS_DATE_COLUMNS,
+        engine='pyarrow'
+    )
+
+@functools.cache
+def _load_tokens():
+    """Read token.json once per process"""
+    return _read_json(TOKEN_FILE)
+
 def get_okta_id():
     """Extract Okta ID from token file"""
     try:
-        with open(r'assests\token.json', 'r', encoding='utf-8') as f:
-            tokens = json.load(f)
+        tokens = _load_tokens()
         
         transaction_id = tokens.get('transaction_id', '')
         
@@ -36,55 +111,89 @@ def get_okta_id():
         logger.error(f"Error extracting Okta ID: {e}")
         return None
 
-# Load tokens
-with open(r'assests\token.json', 'r', encoding='utf-8') as f:
-    tokens = json.load(f)
-
-access_token = tokens.get("access_token")
-x_jwt_token = tokens.get("party_token")
-x_membersship_profile_token = tokens.get("membership_profile_token")
-transaction_id = tokens.get("transaction_id")
-
-# Get Okta ID
-okta_id = get_okta_id()
-if not okta_id:
-    logger.error("Could not extract Okta ID from token file")
-    exit(1)
-
-logger.info(f"Using Okta ID: {okta_id}")
+# Cap on in-flight API calls, plus a token-bucket limit on how fast new calls start
+MAX_CONCURRENT_REQUESTS = 8
+MAX_REQUESTS_PER_SECOND = 5
+REQUEST_TIMEOUT = 30
+MAX_RETRIES = 3
+CONNECTION_POOL_SIZE = 16
+RESULTS_DIR = os.path.join(BASE_DIR, "api_results")
+REPORTS_DIR = os.path.join(BASE_DIR, "reports")
+CACHE_DIR = os.path.join(RESULTS_DIR, ".cache")
+CACHE_TTL_SECONDS = 3600
+RETRY_STATUSES = {429, 500, 502, 503, 504}
 
 class WyndhamAPIClient:
     def __init__(self):
         self.base_url = "https://api.wvc.wyndhamdestinations.com/resort-operations/v3/resorts/availability"
-        self.okta_id = okta_id
+        
+        # Tokens are read lazily here rather than when the module is imported
+        tokens = _load_tokens()
+        access_token = tokens.get("access_token")
+        x_jwt_token = tokens.get("party_token")
+        x_membersship_profile_token = tokens.get("membership_profile_token")
+        transaction_id = tokens.get("transaction_id")
+        
+        self.okta_id = get_okta_id()
+        if not self.okta_id:
+            raise ValueError("Could not extract Okta ID from token file")
+        logger.info(f"Using Okta ID: {self.okta_id}")
+        
+        self.product_id_cache = {}
+        self.rate_limiter = AsyncLimiter(MAX_REQUESTS_PER_SECOND, 1)
+        
+        # One results directory and filename timestamp per run instead of per saved file
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        self.run_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        # Cached responses are only valid for the token they were fetched with
+        self.cache_version = transaction_id or ""
         
         self.headers = {
             "accept": "application/json, text/plain, */*",
-            "authorization": f"Bearer {access_token}",
+            "authorization": "Bearer " + (access_token or ""),
             "content-type": "application/json;charset=UTF-8",
             "x-brandid": "000",
             "x-channel": "WEB",
-            "x-jwt-token": f"{x_jwt_token}",
-            "x-membership-profile-token": f"{x_membersship_profile_token}",
+            "x-jwt-token": x_jwt_token or "",
+            "x-membership-profile-token": x_membersship_profile_token or "",
             "x-originator-applicationid": "CUI",
-            "x-transactionid": f"{transaction_id}",
+            "x-transactionid": transaction_id or "",
             "x-userid": "KITTY2112$"
         }
+        
+        # Static request body; only the product and dates change per call
+        self._payload_template = {
+            "oktaId": self.okta_id,
+            "productId": None,
+            "checkInDate": None,
+            "checkOutDate": None,
+            "filters": [
+                {"filterType": "include-accessable-units", "filterValues": False},
+                {"filterType": "include-clubpass-resorts", "filterValues": "true"}
+            ],
+            "purchaseType": False
+        }
+
+    def create_session(self):
+        """Create a pooled HTTP/2 client carrying the static headers"""
+        limits = httpx.Limits(
+            max_connections=CONNECTION_POOL_SIZE,
+            max_keepalive_connections=CONNECTION_POOL_SIZE
+        )
+        return httpx.AsyncClient(http2=True, headers=self.headers, limits=limits, timeout=REQUEST_TIMEOUT)
 
     def load_resort_mapping(self):
         """Load resort mapping from CSV file"""
         try:
-            df = pd.read_csv('assests/final_MASTER_merged_ssms_with_tzort_mapping.csv')
-            
-            # Create mapping from ResortId to Wyndham resort id
-            mapping = df.drop_duplicates('ResortId')[['ResortId', 'resort id in wyndham onwner site']].copy()
-            mapping = mapping.dropna(subset=['resort id in wyndham onwner site'])
+            # Copy so callers can't alter the cached mapping
+            mapping_dict = dict(_read_resort_mapping(RESORT_MAPPING_FILE, os.path.getmtime(RESORT_MAPPING_FILE)))
             
-            mapping_dict = {}
-            for _, row in mapping.iterrows():
-                resort_id = int(row['ResortId'])
-                wyndham_id = float(row['resort id in wyndham onwner site'])
-                mapping_dict[resort_id] = wyndham_id
+            # Only a few dozen distinct Wyndham ids, so format each product id once
+            self.product_id_cache = {
+                wyndham_id: self.create_product_id(wyndham_id) for wyndham_id in set(mapping_dict.values())
+            }
             
             logger.info(f"Loaded {len(mapping_dict)} resort mappings")
             return mapping_dict
@@ -96,12 +205,22 @@ class WyndhamAPIClient:
     def load_orders_data(self):
         """Load orders data and filter for MinUnits > 1"""
         try:
-            df = pd.read_csv('csvs/all_resorts_detailed_orders.csv')
+            df = _read_orders_csv(ORDERS_FILE, os.path.getmtime(ORDERS_FILE))
             
             # Filter for MinUnits > 1
-            filtered_df = df[df['MinUnits'] > 1].copy()
+            filtered_df = df[df['MinUnits'] > 1]
             logger.info(f"Found {len(filtered_df)} orders with MinUnits > 1")
             
+            # Make sure both dates are datetimes; anything unparseable becomes NaT and is dropped
+            filtered_df = filtered_df.assign(
+                Arrival=pd.to_datetime(filtered_df['Arrival'], errors='coerce', format='%Y-%m-%d'),
+                Departure=pd.to_datetime(filtered_df['Departure'], errors='coerce', format='%Y-%m-%d')
+            )
+            invalid_dates = filtered_df['Arrival'].isna() | filtered_df['Departure'].isna()
+            if invalid_dates.any():
+                logger.error(f"Dropping {int(invalid_dates.sum())} orders with invalid dates")
+                filtered_df = filtered_df[~invalid_dates]
+            
             # Get unique combinations of ResortId, Arrival, Departure
             unique_requests = filtered_df[['ResortId', 'Resort', 'Arrival', 'Departure']].drop_duplicates()
             logger.info(f"Found {len(unique_requests)} unique resort/date combinations")
@@ -118,52 +237,84 @@ class WyndhamAPIClient:
         padded_number = f"{resort_number:012d}"
         return f"PI|R{padded_number}"
 
-    def fetch_availability(self, product_id, check_in_date, check_out_date, resort_name):
-        """Fetch availability for a resort"""
-        # Update timestamp
-        self.headers["x-request-timestamp"] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%fZ")[:-3] + "Z"
+    def _cache_path(self, product_id, check_in_date, check_out_date):
+        """Cache file for one (product_id, check_in, check_out) request under the current token"""
+        cache_key = f"{self.cache_version}|{product_id}|{check_in_date}|{check_out_date}"
+        return os.path.join(CACHE_DIR, hashlib.sha1(cache_key.encode('utf-8')).hexdigest() + ".json")
+
+    def load_cached_availability(self, product_id, check_in_date, check_out_date):
+        """Return a cached API response if one was saved within CACHE_TTL_SECONDS"""
+        cache_path = self._cache_path(product_id, check_in_date, check_out_date)
+        try:
+            if time.time() - os.path.getmtime(cache_path) > CACHE_TTL_SECONDS:
+                return None
+            return _read_json(cache_path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Ignoring unreadable cache entry %s: %s", cache_path, e)
+            return None
+
+    def save_cached_availability(self, product_id, check_in_date, check_out_date, raw_response):
+        """Store the raw API response bytes for later runs"""
+        try:
+            with open(self._cache_path(product_id, check_in_date, check_out_date), 'wb') as f:
+                f.write(raw_response)
+        except Exception as e:
+            logger.warning("Could not cache response for %s: %s", product_id, e)
+
+    async def fetch_availability(self, session, product_id, check_in_date, check_out_date, resort_name):
+        """Fetch availability for a resort, reusing a recent cached response when available"""
+        cached = self.load_cached_availability(product_id, check_in_date, check_out_date)
+        if cached is not None:
+            logger.info("♻️ Using cached response for %s (%s) from %s to %s", resort_name, product_id, check_in_date, check_out_date)
+            return cached
         
-        payload = {
-            "oktaId": self.okta_id,
-            "productId": product_id,
-            "checkInDate": check_in_date,
-            "checkOutDate": check_out_date,
-            "filters": [
-                {"filterType": "include-accessable-units", "filterValues": False},
-                {"filterType": "include-clubpass-resorts", "filterValues": "true"}
-            ],
-            "purchaseType": False
-        }
+        payload = self._payload_template.copy()
+        payload["productId"] = product_id
+        payload["checkInDate"] = check_in_date
+        payload["checkOutDate"] = check_out_date
+        # Serialize once with orjson; the session already sends the JSON content-type
+        body = orjson.dumps(payload)
         
         try:
-            logger.info(f"Fetching {resort_name} ({product_id}) from {check_in_date} to {check_out_date}")
+            logger.info("Fetching %s (%s) from %s to %s", resort_name, product_id, check_in_date, check_out_date)
             
-            response = requests.post(self.base_url, headers=self.headers, json=payload, timeout=30)
-            
-            if response.status_code == 200:
-                logger.info("✅ Success")
-                return response.json()
-            else:
-                logger.warning(f"❌ Failed: {response.status_code} - {response.text}")
+            for attempt in range(1, MAX_RETRIES + 1):
+                async with self.rate_limiter:
+                    # Only the timestamp changes per attempt; static headers come from the session
+                    request_headers = {
+                        "x-request-timestamp": datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+                    }
+                    response = await session.post(self.base_url, headers=request_headers, content=body)
+                if response.status_code == 200:
+                    logger.info("✅ Success")
+                    raw_response = response.content
+                    self.save_cached_availability(product_id, check_in_date, check_out_date, raw_response)
+                    return orjson.loads(raw_response)
+                
+                # Back off on rate limiting and transient server errors
+                if response.status_code in RETRY_STATUSES and attempt < MAX_RETRIES:
+                    logger.warning("⏳ Got %s, retrying %s in %ss", response.status_code, resort_name, attempt)
+                    await asyncio.sleep(attempt)
+                    continue
+                
+                logger.warning("❌ Failed: %s - %s", response.status_code, response.text)
                 return None
                 
         except Exception as e:
-            logger.error(f"❌ Error: {e}")
+            logger.error("❌ Error: %s", e)
             return None
 
     def save_individual_result(self, resort_id, resort_name, product_id, check_in, check_out, api_data):
         """Save individual API result to separate file"""
         try:
-            # Create results directory
-            os.makedirs("api_results", exist_ok=True)
-            
             # Create filename with resort info and dates
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             safe_resort_name = "".join(c for c in resort_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
             safe_resort_name = safe_resort_name.replace(' ', '_')
             
-            filename = f"resort_{resort_id}_{safe_resort_name}_{check_in}_to_{check_out}_{timestamp}.json"
-            filepath = os.path.join("api_results", filename)
+            filename = f"resort_{resort_id}_{safe_resort_name}_{check_in}_to_{check_out}_{self.run_timestamp}.json"
+            filepath = os.path.join(RESULTS_DIR, filename)
             
             # Prepare data to save
             result_data = {
@@ -179,18 +330,53 @@ class WyndhamAPIClient:
                 "api_response": api_data
             }
             
-            # Save to file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(result_data, f, indent=2, ensure_ascii=False)
+            # Save to file compactly; these are only read back by the extractor
+            _write_json(filepath, result_data, indent=False)
             
-            logger.info(f"💾 Saved result to: {filename}")
+            logger.info("💾 Saved result to: %s", filename)
             return filepath
             
         except Exception as e:
-            logger.error(f"Error saving individual result: {e}")
+            logger.error("Error saving individual result: %s", e)
             return None
 
-    def process_csv_data(self):
+    async def _bounded_fetch(self, session, semaphore, request):
+        """Fetch one resort/date combination under the semaphore"""
+        async with semaphore:
+            return await self.fetch_availability(
+                session, request['product_id'], request['check_in'],
+                request['check_out'], request['resort_name']
+            )
+
+    async def _process_request(self, session, semaphore, request, total_requests, pending_fetches):
+        """Fetch one resort/date combination and save the result"""
+        # Resorts sharing a Wyndham product and dates share a single API call
+        request_key = (request['product_id'], request['check_in'], request['check_out'])
+        if request_key not in pending_fetches:
+            pending_fetches[request_key] = asyncio.ensure_future(self._bounded_fetch(session, semaphore, request))
+        api_data = await pending_fetches[request_key]
+        
+        # Save individual result to file on a worker thread so disk I/O doesn't stall the event loop
+        filepath = await asyncio.to_thread(
+            self.save_individual_result,
+            request['resort_id'], request['resort_name'], request['product_id'],
+            request['check_in'], request['check_out'], api_data
+        )
+        
+        self.completed_count += 1
+        
+        # Progress update every 5 requests
+        if self.completed_count % 5 == 0:
+            logger.info("📊 Progress: %d/%d processed", self.completed_count, total_requests)
+        
+        return {
+            **request,
+            'status': "SUCCESS" if api_data else "FAILED",
+            'filepath': filepath,
+            'fetch_timestamp': datetime.now().isoformat()
+        }
+
+    async def process_csv_data(self):
         """Main method to process CSV data and make API calls"""
         # Load mapping and orders data
         resort_mapping = self.load_resort_mapping()
@@ -200,83 +386,65 @@ class WyndhamAPIClient:
             logger.warning("No orders data found")
             return []
         
-        results = []
-        processed_count = 0
-        success_count = 0
         error_count = 0
         
-        total_requests = len(orders_df)
-        logger.info(f"Starting to process {total_requests} API requests...")
+        # Convert dates to YYYY-MM-DD format in one pass
+        orders_df = orders_df.assign(
+            arrival_date=orders_df['Arrival'].dt.strftime('%Y-%m-%d'),
+            departure_date=orders_df['Departure'].dt.strftime('%Y-%m-%d')
+        )
         
-        for index, row in orders_df.iterrows():
-            try:
-                resort_id = int(row['ResortId'])
-                resort_name = row['Resort']
-                arrival = row['Arrival']
-                departure = row['Departure']
-                
-                # Check if we have mapping for this resort
-                if resort_id not in resort_mapping:
-                    logger.warning(f"No Wyndham mapping found for ResortId {resort_id} ({resort_name})")
-                    error_count += 1
-                    continue
-                
-                wyndham_resort_id = resort_mapping[resort_id]
-                product_id = self.create_product_id(wyndham_resort_id)
-                
-                # Convert dates to YYYY-MM-DD format
-                try:
-                    arrival_date = pd.to_datetime(arrival).strftime('%Y-%m-%d')
-                    departure_date = pd.to_datetime(departure).strftime('%Y-%m-%d')
-                except Exception as date_error:
-                    logger.error(f"Invalid date format for {resort_name}: {arrival} to {departure} - {date_error}")
-                    error_count += 1
-                    continue
-                
-                logger.info(f"[{processed_count + 1}/{total_requests}] Processing: {resort_name} (ResortId: {resort_id} -> Product: {product_id})")
-                
-                # Fetch availability data
-                api_data = self.fetch_availability(product_id, arrival_date, departure_date, resort_name)
-                
-                processed_count += 1
-                
-                # Save individual result to file
-                filepath = self.save_individual_result(
-                    resort_id, resort_name, product_id, 
-                    arrival_date, departure_date, api_data
-                )
-                
-                if api_data:
-                    success_count += 1
-                    status = "SUCCESS"
-                else:
-                    error_count += 1
-                    status = "FAILED"
-                
-                # Track result
-                results.append({
-                    'resort_id': resort_id,
-                    'resort_name': resort_name,
-                    'wyndham_resort_id': wyndham_resort_id,
-                    'product_id': product_id,
-                    'check_in': arrival_date,
-                    'check_out': departure_date,
-                    'status': status,
-                    'filepath': filepath,
-                    'fetch_timestamp': datetime.now().isoformat()
-                })
-                
-                # Progress update every 5 requests
-                if processed_count % 5 == 0:
-                    logger.info(f"📊 Progress: {processed_count}/{total_requests} processed, {success_count} successful, {error_count} failed")
-                
-                # Delay between requests to avoid rate limiting
-                time.sleep(1)
-                
-            except Exception as row_error:
-                logger.error(f"Error processing row {index}: {row_error}")
+        # Attach the Wyndham resort id and look up its precomputed product id
+        orders_df = orders_df.assign(wyndham_resort_id=orders_df['ResortId'].map(resort_mapping))
+        unmapped = orders_df['wyndham_resort_id'].isna()
+        unmapped_count = int(unmapped.sum())
+        if unmapped_count:
+            unmapped_ids = orders_df.loc[unmapped, 'ResortId'].unique()
+            logger.warning("No Wyndham mapping found for %d orders across %d ResortIds: %s",
+                           unmapped_count, len(unmapped_ids), sorted(unmapped_ids.tolist()))
+        error_count += unmapped_count
+        orders_df = orders_df[~unmapped]
+        orders_df = orders_df.assign(product_id=orders_df['wyndham_resort_id'].map(self.product_id_cache))
+        
+        requests_list = orders_df.rename(columns={
+            'ResortId': 'resort_id',
+            'Resort': 'resort_name',
+            'arrival_date': 'check_in',
+            'departure_date': 'check_out'
+        })[['resort_id', 'resort_name', 'wyndham_resort_id', 'product_id', 'check_in', 'check_out']].to_dict('records')
+        
+        total_requests = len(requests_list)
+        logger.info(f"Starting to process {total_requests} API requests ({MAX_CONCURRENT_REQUESTS} at a time)...")
+        
+        self.completed_count = 0
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        pending_fetches = {}
+        
+        async with self.create_session() as session:
+            outcomes = await asyncio.gather(
+                *[
+                    self._process_request(session, semaphore, request, total_requests, pending_fetches)
+                    for request in requests_list
+                ],
+                return_exceptions=True
+            )
+        
+        if len(pending_fetches) < total_requests:
+            logger.info(f"Made {len(pending_fetches)} API calls for {total_requests} requests after de-duplication")
+        
+        results = []
+        for request, outcome in zip(requests_list, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error("Error processing %s: %s", request['resort_name'], outcome)
                 error_count += 1
                 continue
+            
+            if outcome['status'] == "FAILED":
+                error_count += 1
+            results.append(outcome)
+        
+        processed_count = len(results)
+        success_count = processed_count - sum(1 for r in results if r['status'] == "FAILED")
         
         logger.info(f"🏁 Completed: {processed_count} total requests, {success_count} successful, {error_count} failed")
         return results
@@ -284,26 +452,24 @@ class WyndhamAPIClient:
     def save_summary_report(self, results):
         """Save summary report of all API calls"""
         try:
-            os.makedirs("reports", exist_ok=True)
+            os.makedirs(REPORTS_DIR, exist_ok=True)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             
-            # Save summary CSV
-            summary_df = pd.DataFrame(results)
-            csv_path = f"reports/api_calls_summary_{timestamp}.csv"
-            summary_df.to_csv(csv_path, index=False)
+            # Save summary CSV straight from the result dicts with the pyarrow writer
+            csv_path = os.path.join(REPORTS_DIR, f"api_calls_summary_{timestamp}.csv")
+            pacsv.write_csv(pa.Table.from_pylist(results), csv_path)
             
             # Save summary JSON
-            json_path = f"reports/api_calls_summary_{timestamp}.json"
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "summary": {
-                        "total_requests": len(results),
-                        "successful": len([r for r in results if r['status'] == 'SUCCESS']),
-                        "failed": len([r for r in results if r['status'] == 'FAILED']),
-                        "generation_time": datetime.now().isoformat()
-                    },
-                    "results": results
-                }, f, indent=2, ensure_ascii=False)
+            json_path = os.path.join(REPORTS_DIR, f"api_calls_summary_{timestamp}.json")
+            _write_json(json_path, {
+                "summary": {
+                    "total_requests": len(results),
+                    "successful": len([r for r in results if r['status'] == 'SUCCESS']),
+                    "failed": len([r for r in results if r['status'] == 'FAILED']),
+                    "generation_time": datetime.now().isoformat()
+                },
+                "results": results
+            })
             
             logger.info(f"📋 Summary report saved to: {csv_path} and {json_path}")
             return csv_path, json_path
@@ -312,13 +478,17 @@ class WyndhamAPIClient:
             logger.error(f"Error saving summary report: {e}")
             return None, None
 
-def main():
+async def main():
     print("🚀 Starting CSV-based API Data Fetching...\n")
     
-    client = WyndhamAPIClient()
+    try:
+        client = WyndhamAPIClient()
+    except Exception as e:
+        logger.error(f"Could not create API client: {e}")
+        exit(1)
     
     # Process CSV data and make API calls
-    results = client.process_csv_data()
+    results = await client.process_csv_data()
     
     if results:
         # Save summary report
@@ -331,7 +501,7 @@ def main():
         print(f"\n🎉 Processing Complete!")
         print(f"   ✅ Successful API calls: {len(successful)}")
         print(f"   ❌ Failed API calls: {len(failed)}")
-        print(f"   📁 Individual files saved in: api_results/")
+        print(f"   📁 Individual files saved in: {RESULTS_DIR}")
         print(f"   📋 Summary report: {csv_path}")
         
         # Show sample successful calls
@@ -343,4 +513,7 @@ def main():
         print("❌ No data was processed")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
\ No newline at end of file
@@ -1,10 +1,20 @@
 import jwt
-import json
+import orjson
+import os
+
+TOKEN_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assests', 'token.json')
+
+def _write_json_atomic(path, obj):
+    """Write an indented JSON file via a temp file so readers never see a partial write"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_path, path)
 
 def generate_transaction_id():
-    json_path = r'assests\token.json'
-    with open(json_path, 'r', encoding='utf-8') as f:
-        tokens = json.load(f)
+    json_path = TOKEN_FILE
+    with open(json_path, 'rb') as f:
+        tokens = orjson.loads(f.read())
 
     jwt_token = tokens.get("party_token")
     if not jwt_token:
@@ -13,15 +23,15 @@ def generate_transaction_id():
     try:
         decoded = jwt.decode(jwt_token, options={"verify_signature": False})
         correlation_id = decoded.get('correlation_id')
-        if correlation_id:
+        # Only rewrite token.json when the transaction id actually changed
+        if correlation_id and tokens.get('transaction_id') != correlation_id:
             tokens['transaction_id'] = correlation_id
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(tokens, f, indent=2)
+            _write_json_atomic(json_path, tokens)
         return correlation_id
     except Exception as e:
         print(f"Error decoding JWT: {e}")
         return None
 
-transaction_id = generate_transaction_id()
-print(transaction_id)
-
+if __name__ == "__main__":
+    transaction_id = generate_transaction_id()
+    print(transaction_id)
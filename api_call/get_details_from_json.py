@@ -1,147 +1,211 @@
-import json
+import orjson
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from datetime import datetime
+import io
 import os
+import sys
 import glob
 
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BASE_DIR, 'api_results')
+EXTRACTED_DIR = os.path.join(BASE_DIR, 'extracted_results')
+
+def _read_json(path):
+    """Read a JSON file with orjson"""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+def _write_csv(df, path):
+    """Write a DataFrame to CSV with pyarrow's writer"""
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path)
+
+def _min_daily_availability(calendar_days):
+    """Minimum across days of the maximum available count across consumer types"""
+    # Each day's slice starts with a 0 so empty days count as 0, as before
+    counts = []
+    day_starts = []
+    for day in calendar_days:
+        day_starts.append(len(counts))
+        counts.append(0)
+        counts.extend(int(inv.get('availableCount', 0)) for inv in day.get('inventoryOfferings', []))
+    
+    # Handle case where no days found
+    if not day_starts:
+        return 0
+    
+    return int(np.maximum.reduceat(np.array(counts, dtype=np.int64), day_starts).min())
+
+def _extract_detailed(data, extraction_date=None):
+    """Build the detailed availability DataFrame from an already-parsed result file (None if no rows)"""
+    if extraction_date is None:
+        extraction_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    # Get request info from the file structure
+    request_info = data.get('request_info', {})
+    api_response = data.get('api_response', {})
+    
+    # If no API response (failed call), there is nothing to build
+    if not api_response:
+        return None
+    
+    # Build columns directly instead of one dict per row
+    resort_names = []
+    offering_names = []
+    unit_types = []
+    unit_names = []
+    product_ids = []
+    original_points = []
+    current_points = []
+    available_counts = []
+    resorts = api_response.get('resorts', [])
+    
+    if resorts:
+        for resort in resorts:
+            resort_name = resort.get('name', 'Unknown Resort')
+            product_id = resort.get('productId', '')
+            
+            resort_offerings = resort.get('resortOfferings', [])
+            
+            for offering in resort_offerings:
+                offering_name = offering.get('offeringName', '')
+                accom_classes = offering.get('accomdationClasses', [])
+                
+                for accom in accom_classes:
+                    unit_type = accom.get('unitType', '')
+                    unit_name = accom.get('unitName', '')
+                    total_points_before = int(accom.get('totalPointsBeforeDiscount', 0))
+                    total_points_after = int(accom.get('totalPointsAfterDiscount', 0))
+                    
+                    min_available = _min_daily_availability(accom.get('calendarDays', []))
+                    
+                    resort_names.append(resort_name)
+                    offering_names.append(offering_name)
+                    unit_types.append(unit_type)
+                    unit_names.append(unit_name)
+                    product_ids.append(product_id)
+                    original_points.append(total_points_before)
+                    current_points.append(total_points_after)
+                    available_counts.append(min_available)
+    
+    # Request info is constant per file, so those columns are filled in one go
+    row_count = len(resort_names)
+    if not row_count:
+        return None
+    
+    # Savings and discount for all rows at once
+    original = np.array(original_points, dtype=np.int64)
+    current = np.array(current_points, dtype=np.int64)
+    savings = original - current
+    with np.errstate(divide='ignore', invalid='ignore'):
+        discount_percentages = np.where(original > 0, np.round(savings / original * 100, 1), 0.0)
+    
+    return pd.DataFrame({
+        'resort_id': [request_info.get('resort_id', '')] * row_count,
+        'check_in': [request_info.get('check_in', '')] * row_count,
+        'check_out': [request_info.get('check_out', '')] * row_count,
+        'resort_name': resort_names,
+        'offering_name': offering_names,
+        'unit_type': unit_types,
+        'unit_name': unit_names,
+        'product_id': product_ids,
+        'original_points': original,
+        'current_points': current,
+        'available_count': available_counts,
+        'savings': savings,
+        'discount_percentage': discount_percentages,
+        'extraction_date': [extraction_date] * row_count,
+        'fetch_timestamp': [request_info.get('fetch_timestamp', '')] * row_count
+    }, copy=False)
+
 def extract_detailed_availability_from_json(json_file_path):
     """
     Extract detailed availability data from JSON response file using actual counts
     """
     try:
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Get request info from the file structure
-        request_info = data.get('request_info', {})
-        api_response = data.get('api_response', {})
-        
-        # If no API response (failed call), return empty DataFrame
-        if not api_response:
-            return pd.DataFrame()
-        
-        detailed_data = []
-        resorts = api_response.get('resorts', [])
-        
-        if resorts:
-            for resort in resorts:
-                resort_name = resort.get('name', 'Unknown Resort')
-                product_id = resort.get('productId', '')
-                
-                resort_offerings = resort.get('resortOfferings', [])
-                
-                for offering in resort_offerings:
-                    offering_name = offering.get('offeringName', '')
-                    accom_classes = offering.get('accomdationClasses', [])
-                    
-                    for accom in accom_classes:
-                        unit_type = accom.get('unitType', '')
-                        unit_name = accom.get('unitName', '')
-                        total_points_before = int(accom.get('totalPointsBeforeDiscount', 0))
-                        total_points_after = int(accom.get('totalPointsAfterDiscount', 0))
-                        
-                        # Calculate minimum available count across all days
-                        min_available = float('inf')
-                        calendar_days = accom.get('calendarDays', [])
-                        
-                        for day in calendar_days:
-                            date = day.get('date', '')
-                            inventory_offerings = day.get('inventoryOfferings', [])
-                            
-                            # For each day, take the MAXIMUM available count across consumer types
-                            day_max_available = 0
-                            for inv in inventory_offerings:
-                                available_count = int(inv.get('availableCount', 0))
-                                day_max_available = max(day_max_available, available_count)
-                            
-                            # Take the MINIMUM across all days (bottleneck for the entire stay)
-                            min_available = min(min_available, day_max_available)
-                        
-                        # Handle case where no days found
-                        if min_available == float('inf'):
-                            min_available = 0
-                        
-                        detailed_data.append({
-                            'resort_id': request_info.get('resort_id', ''),
-                            'check_in': request_info.get('check_in', ''),
-                            'check_out': request_info.get('check_out', ''),
-                            'resort_name': resort_name,
-                            'offering_name': offering_name,
-                            'unit_type': unit_type,
-                            'unit_name': unit_name,
-                            'product_id': product_id,
-                            'original_points': total_points_before,
-                            'current_points': total_points_after,
-                            'available_count': min_available,
-                            'savings': total_points_before - total_points_after,
-                            'discount_percentage': round(((total_points_before - total_points_after) / total_points_before * 100), 1) if total_points_before > 0 else 0,
-                            'extraction_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                            'fetch_timestamp': request_info.get('fetch_timestamp', '')
-                        })
-        
-        return pd.DataFrame(detailed_data)
-        
+        detailed_df = _extract_detailed(_read_json(json_file_path))
+        return detailed_df if detailed_df is not None else pd.DataFrame()
     except Exception as e:
         print(f"Error extracting detailed data from {json_file_path}: {e}")
         return pd.DataFrame()
 
-def extract_daily_breakdown_from_json(json_file_path):
-    """Extract day-by-day breakdown from JSON file"""
-    try:
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        request_info = data.get('request_info', {})
-        api_response = data.get('api_response', {})
-        
-        if not api_response:
-            return pd.DataFrame()
-        
-        daily_data = []
-        resorts = api_response.get('resorts', [])
-        
-        if resorts:
-            for resort in resorts:
-                resort_name = resort.get('name', 'Unknown Resort')
-                resort_offerings = resort.get('resortOfferings', [])
+def _extract_daily(data):
+    """Build the day-by-day breakdown DataFrame from an already-parsed result file (None if no rows)"""
+    request_info = data.get('request_info', {})
+    api_response = data.get('api_response', {})
+    
+    if not api_response:
+        return None
+    
+    resort_names = []
+    dates = []
+    unit_names = []
+    consumer_types = []
+    available_counts = []
+    resorts = api_response.get('resorts', [])
+    
+    if resorts:
+        for resort in resorts:
+            resort_name = resort.get('name', 'Unknown Resort')
+            resort_offerings = resort.get('resortOfferings', [])
+            
+            for offering in resort_offerings:
+                accom_classes = offering.get('accomdationClasses', [])
                 
-                for offering in resort_offerings:
-                    accom_classes = offering.get('accomdationClasses', [])
+                for accom in accom_classes:
+                    unit_name = accom.get('unitName', '')
+                    calendar_days = accom.get('calendarDays', [])
                     
-                    for accom in accom_classes:
-                        unit_name = accom.get('unitName', '')
-                        calendar_days = accom.get('calendarDays', [])
+                    for day in calendar_days:
+                        date = day.get('date', '')
+                        inventory_offerings = day.get('inventoryOfferings', [])
                         
-                        for day in calendar_days:
-                            date = day.get('date', '')
-                            inventory_offerings = day.get('inventoryOfferings', [])
-                            
-                            for inv in inventory_offerings:
-                                consumer_type = inv.get('consumerType', '')
-                                available_count = int(inv.get('availableCount', 0))
-                                
-                                daily_data.append({
-                                    'resort_id': request_info.get('resort_id', ''),
-                                    'check_in': request_info.get('check_in', ''),
-                                    'check_out': request_info.get('check_out', ''),
-                                    'resort_name': resort_name,
-                                    'date': date,
-                                    'unit_name': unit_name,
-                                    'consumer_type': consumer_type,
-                                    'available_count': available_count
-                                })
-        
-        return pd.DataFrame(daily_data)
-        
+                        for inv in inventory_offerings:
+                            resort_names.append(resort_name)
+                            dates.append(date)
+                            unit_names.append(unit_name)
+                            consumer_types.append(inv.get('consumerType', ''))
+                            available_counts.append(int(inv.get('availableCount', 0)))
+    
+    row_count = len(resort_names)
+    if not row_count:
+        return None
+    
+    return pd.DataFrame({
+        'resort_id': [request_info.get('resort_id', '')] * row_count,
+        'check_in': [request_info.get('check_in', '')] * row_count,
+        'check_out': [request_info.get('check_out', '')] * row_count,
+        'resort_name': resort_names,
+        'date': dates,
+        'unit_name': unit_names,
+        'consumer_type': consumer_types,
+        'available_count': available_counts
+    }, copy=False)
+
+def extract_daily_breakdown_from_json(json_file_path):
+    """Extract day-by-day breakdown from JSON file"""
+    try:
+        daily_df = _extract_daily(_read_json(json_file_path))
+        return daily_df if daily_df is not None else pd.DataFrame()
     except Exception as e:
         print(f"Error extracting daily breakdown from {json_file_path}: {e}")
         return pd.DataFrame()
 
+def _process_one(json_file, extraction_date=None):
+    """Parse one result file and run both extractors on it"""
+    try:
+        data = _read_json(json_file)
+        return _extract_detailed(data, extraction_date), _extract_daily(data), None
+    except Exception as e:
+        return None, None, str(e)
+
 def process_all_api_results():
     """Process all JSON files in api_results folder"""
     
     # Get all JSON files from api_results folder
-    json_files = glob.glob("api_results/*.json")
+    json_files = glob.glob(os.path.join(RESULTS_DIR, "*.json"))
     
     if not json_files:
         print("❌ No JSON files found in api_results folder")
@@ -154,71 +218,78 @@ def process_all_api_results():
     processed_count = 0
     success_count = 0
     
+    # One extraction timestamp shared by every row of this run
+    extraction_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    # Per-file status lines are buffered and written once after the loop
+    log_buffer = io.StringIO()
+    log = log_buffer.write
+    
+    # Per-file work is a millisecond or two, less than a worker pool's startup and pickling cost
     for json_file in json_files:
-        try:
-            print(f"📁 Processing: {os.path.basename(json_file)}")
-            
-            # Extract detailed availability
-            detailed_df = extract_detailed_availability_from_json(json_file)
-            if not detailed_df.empty:
-                all_detailed_data.append(detailed_df)
-                success_count += 1
-                print(f"   ✅ Found {len(detailed_df)} accommodation options")
-            else:
-                print(f"   ⚠️ No availability data found")
-            
-            # Extract daily breakdown
-            daily_df = extract_daily_breakdown_from_json(json_file)
-            if not daily_df.empty:
-                all_daily_data.append(daily_df)
-            
-            processed_count += 1
-            
-        except Exception as e:
-            print(f"   ❌ Error processing {json_file}: {e}")
+        detailed_df, daily_df, error = _process_one(json_file, extraction_date)
+        log(f"📁 Processing: {os.path.basename(json_file)}\n")
+        
+        if error is not None:
+            log(f"   ❌ Error processing {json_file}: {error}\n")
             continue
+        
+        # Extract detailed availability
+        if detailed_df is not None:
+            all_detailed_data.append(detailed_df)
+            success_count += 1
+            log(f"   ✅ Found {len(detailed_df)} accommodation options\n")
+        else:
+            log("   ⚠️ No availability data found\n")
+        
+        # Extract daily breakdown
+        if daily_df is not None:
+            all_daily_data.append(daily_df)
+        
+        processed_count += 1
+    
+    sys.stdout.write(log_buffer.getvalue())
+    sys.stdout.flush()
     
     # Combine all data
     if all_detailed_data:
         combined_detailed = pd.concat(all_detailed_data, ignore_index=True)
-        combined_daily = pd.concat(all_daily_data, ignore_index=True) if all_daily_data else pd.DataFrame()
+        combined_daily = pd.concat(all_daily_data, ignore_index=True) if all_daily_data else None
+        
+        # Repeated strings as categories: less memory and integer codes for the groupby
+        combined_detailed = combined_detailed.astype({
+            column: 'category' for column in ('resort_name', 'offering_name', 'unit_type', 'unit_name')
+        })
+        if combined_daily is not None:
+            combined_daily = combined_daily.astype({
+                column: 'category' for column in ('resort_name', 'unit_name', 'consumer_type')
+            })
         
         # Create output directory
-        os.makedirs("extracted_results", exist_ok=True)
+        os.makedirs(EXTRACTED_DIR, exist_ok=True)
         
         # Save combined detailed availability
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        detailed_csv_path = f"extracted_results/all_resort_availability_{timestamp}.csv"
-        combined_detailed.to_csv(detailed_csv_path, index=False)
+        detailed_csv_path = os.path.join(EXTRACTED_DIR, f"all_resort_availability_{timestamp}.csv")
+        _write_csv(combined_detailed, detailed_csv_path)
         
         # Save combined daily breakdown
-        daily_csv_path = f"extracted_results/all_daily_breakdown_{timestamp}.csv"
-        if not combined_daily.empty:
-            combined_daily.to_csv(daily_csv_path, index=False)
+        daily_csv_path = os.path.join(EXTRACTED_DIR, f"all_daily_breakdown_{timestamp}.csv")
+        if combined_daily is not None:
+            _write_csv(combined_daily, daily_csv_path)
         
         # Save summary by resort
-        summary_data = []
-        for _, group in combined_detailed.groupby(['resort_id', 'resort_name', 'check_in', 'check_out']):
-            total_units = group['available_count'].sum()
-            min_points = group['current_points'].min() if len(group) > 0 else 0
-            max_points = group['current_points'].max() if len(group) > 0 else 0
-            unit_types = ', '.join(group['unit_type'].unique())
-            
-            summary_data.append({
-                'resort_id': group['resort_id'].iloc[0],
-                'resort_name': group['resort_name'].iloc[0],
-                'check_in': group['check_in'].iloc[0],
-                'check_out': group['check_out'].iloc[0],
-                'total_available_units': total_units,
-                'unit_types_available': unit_types,
-                'min_points_required': min_points,
-                'max_points_required': max_points,
-                'accommodation_options': len(group)
-            })
-        
-        summary_df = pd.DataFrame(summary_data)
-        summary_csv_path = f"extracted_results/resort_summary_{timestamp}.csv"
-        summary_df.to_csv(summary_csv_path, index=False)
+        summary_df = combined_detailed.groupby(
+            ['resort_id', 'resort_name', 'check_in', 'check_out'], as_index=False, observed=True
+        ).agg(
+            total_available_units=('available_count', 'sum'),
+            unit_types_available=('unit_type', lambda s: ', '.join(s.unique())),
+            min_points_required=('current_points', 'min'),
+            max_points_required=('current_points', 'max'),
+            accommodation_options=('unit_type', 'size')
+        )
+        summary_csv_path = os.path.join(EXTRACTED_DIR, f"resort_summary_{timestamp}.csv")
+        _write_csv(summary_df, summary_csv_path)
         
         # Print results
         print(f"\n🎉 Processing Complete!")
@@ -252,7 +323,7 @@ def main():
     
     if detailed_path:
         print(f"\n✅ All extraction completed!")
-        print(f"📂 Check the 'extracted_results' folder for CSV files")
+        print(f"📂 Check the '{EXTRACTED_DIR}' folder for CSV files")
     else:
         print("❌ No data extracted")
 
@@ -1,6 +1,6 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-import json
+import orjson
 import requests
 import time
 import os 
@@ -67,34 +67,28 @@ except Exception as e:
 
 # 4. Extract cookies and local storage
 cookies = driver.get_cookies()
-local_storage = driver.execute_script("""
-    const store = {};
-    for (let i = 0; i < localStorage.length; i++) {
-        let key = localStorage.key(i);
-        store[key] = localStorage.getItem(key);
-    }
-    return store;
-""")
-
-session_storage = driver.execute_script("""
-    const store = {};
-    for (let i = 0; i < sessionStorage.length; i++) {
-        let key = sessionStorage.key(i);
-        store[key] = sessionStorage.getItem(key);
-    }
-    return store;
+# Both storages in one round trip to the browser
+storage = driver.execute_script("""
+    return {
+        local: Object.fromEntries(Object.entries(localStorage)),
+        session: Object.fromEntries(Object.entries(sessionStorage))
+    };
 """)
+local_storage = storage["local"]
+session_storage = storage["session"]
 
 
-save_dir = "auth_data"
+# Anchored to the repo root, where extraction.py reads the session storage back
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+save_dir = os.path.join(BASE_DIR, "auth_data")
 os.makedirs(save_dir, exist_ok=True)
 
-with open(os.path.join(save_dir, "cookies.json"), "w") as f:
-    json.dump(cookies, f, indent=4)
-with open(os.path.join(save_dir, "local_storage.json"), "w") as f:
-    json.dump(local_storage, f, indent=4)
-with open(os.path.join(save_dir, "session_storage.json"), "w") as f:
-    json.dump(session_storage, f, indent=4)
+with open(os.path.join(save_dir, "cookies.json"), "wb") as f:
+    f.write(orjson.dumps(cookies, option=orjson.OPT_INDENT_2))
+with open(os.path.join(save_dir, "local_storage.json"), "wb") as f:
+    f.write(orjson.dumps(local_storage, option=orjson.OPT_INDENT_2))
+with open(os.path.join(save_dir, "session_storage.json"), "wb") as f:
+    f.write(orjson.dumps(session_storage, option=orjson.OPT_INDENT_2))
 print(f"✅ Cookies, local storage, and session storage saved to '{save_dir}' folder.")
 
 driver.quit()
\ No newline at end of file
@@ -1,66 +1,65 @@
 import pyodbc
-import json
+import orjson
+import functools
 import logging
 import os
+import re
+import time
 
 
-os.makedirs("logs", exist_ok=True)
+# Connections used more recently than this are returned without a SELECT 1 liveness probe
+CONNECTION_IDLE_CHECK_SECONDS = 30
 
+@functools.lru_cache(maxsize=1)
+def _load_config():
+    """Read config.json and set up logging on first use instead of at import"""
+    with open(r"database/config.json", "rb") as config_file:
+        config = orjson.loads(config_file.read())
+    
+    log_file = config["logging"].get("log_file", "logs/default.log")
+    os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+    logging.basicConfig(
+        filename=log_file,
+        level=getattr(logging, config["logging"]["log_level"]),
+        format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    return config
 
-with open(r"database/config.json", "r") as config_file:
-    config = json.load(config_file)
+def _redact_password(connection_string):
+    """Connection string safe to log"""
+    return re.sub(r"PWD=[^;]*;", "PWD=***;", connection_string)
 
-log_file = config["logging"].get("log_file", "logs/default.log")
-logging.basicConfig(
-    filename=config["logging"]["log_file"],
-    level=getattr(logging, config["logging"]["log_level"]),
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
+def _build_connection_string(db_config):
+    """ODBC connection string for one database section of config.json"""
+    base = (
+        f"DRIVER={db_config['driver']};"
+        f"SERVER={db_config['server']};"
+        f"DATABASE={db_config['database']};"
+    )
+    # Check if using Windows Authentication or SQL Server Authentication
+    if db_config.get('Trusted_Connection', 'No').lower() == 'yes':
+        auth = "Trusted_Connection=yes;"
+    else:
+        auth = (
+            f"UID={db_config['username']};"
+            f"PWD={db_config['password']};"
+        )
+    return base + auth + f"Connection Timeout={db_config['timeout']};"
 
 class SqlDatabaseConnection:
     def __init__(self, use_fetching_db=False):
-        if use_fetching_db:
-            # Use the fetching_db config for queries
-            db_config = config["database"]["fetching_db"]
-            self.connection = None
-            self.connection_string = (
-                f"DRIVER={db_config['driver']};"
-                f"SERVER={db_config['server']};"
-                f"DATABASE={db_config['database']};"
-                f"UID={db_config['username']};"
-                f"PWD={db_config['password']};"
-                f"Connection Timeout={db_config['timeout']};"
-            )
-        else:
-            # Use the storing_db config 
-            db_config = config["database"]["storing_db"]
-            self.connection = None
-            
-            # Check if using Windows Authentication or SQL Server Authentication
-            if db_config.get('Trusted_Connection', 'No').lower() == 'yes':
-                # Windows Authentication
-                self.connection_string = (
-                    f"DRIVER={db_config['driver']};"
-                    f"SERVER={db_config['server']};"
-                    f"DATABASE={db_config['database']};"
-                    f"Trusted_Connection=yes;"
-                    f"Connection Timeout={db_config['timeout']};"
-                )
-            else:
-                # SQL Server Authentication
-                self.connection_string = (
-                    f"DRIVER={db_config['driver']};"
-                    f"SERVER={db_config['server']};"
-                    f"DATABASE={db_config['database']};"
-                    f"UID={db_config['username']};"
-                    f"PWD={db_config['password']};"
-                    f"Connection Timeout={db_config['timeout']};"
-                )
+        # fetching_db is used for queries, storing_db otherwise
+        db_config = _load_config()["database"]["fetching_db" if use_fetching_db else "storing_db"]
+        self.connection = None
+        self._last_used = 0.0
+        self.connection_string = _build_connection_string(db_config)
+        self._safe_connection_string = _redact_password(self.connection_string)
 
     def connect(self):
         try:
-            print(f"Attempting to connect with: {self.connection_string}")  # Debug line
+            logging.debug("Attempting to connect with: %s", self._safe_connection_string)
             self.connection = pyodbc.connect(self.connection_string)
+            self._last_used = time.monotonic()
             print("Database connection established successfully.")
             logging.info("Database connection established successfully.")
             return True
@@ -71,15 +70,23 @@ class SqlDatabaseConnection:
             return False
 
     def get_connection(self):
-        if self.connection is None:
+        if self.connection is None or self.connection.closed:
             if not self.connect():
                 return None
+            return self.connection
+        
+        # Only probe connections that have been idle for a while
+        now = time.monotonic()
+        if now - self._last_used < CONNECTION_IDLE_CHECK_SECONDS:
+            self._last_used = now
+            return self.connection
         
         try:
             # Test connection
             cursor = self.connection.cursor()
             cursor.execute("SELECT 1")
             cursor.close()
+            self._last_used = now
             return self.connection
         except pyodbc.Error as e:
             print(f"Connection test failed, reconnecting: {e}")
@@ -87,35 +94,13 @@ class SqlDatabaseConnection:
                 return self.connection
             return None
 
-class SqlDatabaseConnectionLegacy:
+class SqlDatabaseConnectionLegacy(SqlDatabaseConnection):
     def __init__(self):
-        db_config = config["database"]["storing_db"]
-        self.connection = None
-        
-        # Check authentication method
-        if db_config.get('Trusted_Connection', 'No').lower() == 'yes':
-            # Windows Authentication
-            self.connection_string = (
-                f"DRIVER={db_config['driver']};"
-                f"SERVER={db_config['server']};"
-                f"DATABASE={db_config['database']};"
-                f"Trusted_Connection=yes;"
-                f"Connection Timeout={db_config['timeout']};"
-            )
-        else:
-            # SQL Server Authentication
-            self.connection_string = (
-                f"DRIVER={db_config['driver']};"
-                f"SERVER={db_config['server']};"
-                f"DATABASE={db_config['database']};"
-                f"UID={db_config['username']};"
-                f"PWD={db_config['password']};"
-                f"Connection Timeout={db_config['timeout']};"
-            )
+        super().__init__(use_fetching_db=False)
 
     def connect(self):
         try:
-            print(f"Attempting to connect with: {self.connection_string}")  
+            logging.debug("Attempting to connect with: %s", self._safe_connection_string)
             self.connection = pyodbc.connect(self.connection_string)
             print("Connection to storing DB established successfully.")
             logging.info("Connection to storing DB established successfully.")
@@ -1,16 +1,21 @@
 import sys
 import os
+import functools
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from datetime import datetime
 
 sys.path.append(os.path.join(os.path.dirname(__file__), 'database'))
 from db import SqlDatabaseConnection
 
+CSV_FOLDER = os.path.join(os.path.dirname(__file__), 'csv')
+
+@functools.cache
 def create_csv_folder():
-    """Create csv folder if it doesn't exist"""
-    csv_folder = os.path.join(os.path.dirname(__file__), 'csv')
-    os.makedirs(csv_folder, exist_ok=True)
-    return csv_folder
+    """Create csv folder if it doesn't exist (checked once per process)"""
+    os.makedirs(CSV_FOLDER, exist_ok=True)
+    return CSV_FOLDER
 
 def save_query_result_to_csv(df):
     """Save the database query result to CSV file"""
@@ -26,13 +31,16 @@ def save_query_result_to_csv(df):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         query_result_file = os.path.join(csv_folder, f"blackout_scrapping_data_{timestamp}.csv")
         
+        # Convert to Arrow once and reuse the table for both files
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        
         # Save to CSV
-        df.to_csv(query_result_file, index=False)
+        pacsv.write_csv(table, query_result_file)
         print(f"Database query result saved to: {query_result_file}")
         
         # Also save a latest version without timestamp
         latest_query_file = os.path.join("latest_blackout_scrapping_data.csv")
-        df.to_csv(latest_query_file, index=False)
+        pacsv.write_csv(table, latest_query_file)
         print(f"Latest query result saved to: {latest_query_file}")
         
     except Exception as e:
@@ -46,16 +54,11 @@ def show_db_fetch_summary(df):
         print("No data fetched from database")
         return
     
-    # Resort-wise RunCount summary
-    resort_summary = df.groupby('ResortId').agg({
-        'RunCount': ['min', 'max', 'nunique'],
-        'Date': ['min', 'max', 'nunique'],
-        'AvailableCount': ['count', 'sum']
-    }).round(2)
-    
-    resort_summary.columns = ['MinRunCount', 'MaxRunCount', 'UniqueRunCounts', 
-                             'EarliestDate', 'LatestDate', 'UniqueDates', 
-                             'TotalRecords', 'TotalAvailableUnits']
+    # Per-resort record count and latest RunCount in one grouped pass
+    resort_stats = df.groupby('ResortId').agg(
+        TotalRecords=('RunCount', 'size'),
+        MaxRunCount=('RunCount', 'max')
+    )
     
     print(f"Total records fetched: {len(df)}")
     print(f"Unique resorts: {df['ResortId'].nunique()}")
@@ -68,9 +71,8 @@ def show_db_fetch_summary(df):
         print(f"  RunCount {runcount}: {count} records")
     
     print("\nTop 10 resorts by record count:")
-    resort_counts = df['ResortId'].value_counts().head(10)
-    for resort_id, count in resort_counts.items():
-        max_runcount = df[df['ResortId'] == resort_id]['RunCount'].max()
+    top_resorts = resort_stats.nlargest(10, 'TotalRecords')
+    for resort_id, count, max_runcount in top_resorts.itertuples():
         print(f"  Resort {resort_id}: {count} records (Max RunCount: {max_runcount})")
     
     print("\nSample data (first 10 records):")
@@ -82,35 +84,25 @@ def show_db_fetch_summary(df):
 def get_all_availability_data():
     """Get today's availability data from BlackoutScrappingData with latest RunCount per resort"""
     query = """
-    WITH LatestRunCounts AS (
+    WITH FilteredData AS (
         SELECT 
             ResortId,
-            MAX(RunCount) as MaxRunCount
+            PropertyTypeId,
+            RoomTypeId,
+            Studio,
+            Bed1,
+            Bed2,
+            Bed3,
+            Bed4,
+            Date,
+            AvailableCount,
+            RunCount,
+            CreationDate,
+            MAX(RunCount) OVER (PARTITION BY ResortId) AS MaxRunCount
         FROM BlackoutScrappingData
         WHERE IsDeleted = 0
-            AND CAST(CreationDate AS DATE) = CAST(GETDATE() AS DATE)
-        GROUP BY ResortId
-    ),
-    FilteredData AS (
-        SELECT 
-            b.ResortId,
-            b.PropertyTypeId,
-            b.RoomTypeId,
-            b.Studio,
-            b.Bed1,
-            b.Bed2,
-            b.Bed3,
-            b.Bed4,
-            b.Date,
-            b.AvailableCount,
-            b.RunCount,
-            b.CreationDate
-        FROM BlackoutScrappingData b
-        INNER JOIN LatestRunCounts l ON 
-            b.ResortId = l.ResortId
-            AND b.RunCount = l.MaxRunCount
-        WHERE b.IsDeleted = 0
-            AND CAST(b.CreationDate AS DATE) = CAST(GETDATE() AS DATE)
+            AND CreationDate >= CAST(GETDATE() AS DATE)
+            AND CreationDate < DATEADD(DAY, 1, CAST(GETDATE() AS DATE))
     )
     SELECT 
         ResortId,
@@ -126,6 +118,7 @@ def get_all_availability_data():
         RunCount,
         CreationDate
     FROM FilteredData
+    WHERE RunCount = MaxRunCount
     ORDER BY ResortId, PropertyTypeId, RoomTypeId, Date
     """
     
@@ -135,7 +128,8 @@ def get_all_availability_data():
         connection = db_connection.get_connection()
         print("Fetching today's availability data with latest RunCount per resort...")
         
-        df = pd.read_sql(query, connection)
+        # One day of rows fits in memory; a single read keeps dtype inference consistent across the whole result
+        df = pd.read_sql(query, connection, dtype_backend='pyarrow')
         print(f"Retrieved {len(df)} availability records (today's data only)")
         
         # Save query result to CSV
@@ -1,3 +1,4 @@
+import glob
 import os
 import pandas as pd
 import logging
@@ -9,6 +10,43 @@ import pytz
 # Load environment variables
 load_dotenv()
 
+# Columns the alert uses from minimum_availability_per_order.csv; text columns are read as str without inference
+USECOLS = ['Resort', 'BedType', 'Arrival', 'Departure', 'Min_Available', 'RoomType', 'PropertyType', 'Vendor']
+DTYPES = {c: 'str' for c in ('Resort', 'BedType', 'Arrival', 'Departure', 'RoomType', 'PropertyType', 'Vendor')}
+
+def _read_csv(file_path):
+    """Parse the alert CSV with Arrow's multi-threaded parser, falling back to the C parser"""
+    try:
+        # The pyarrow engine needs every listed column to be present
+        return pd.read_csv(file_path, engine='pyarrow', usecols=USECOLS, dtype=DTYPES, dtype_backend='pyarrow')
+    except (ImportError, ValueError, KeyError):
+        return pd.read_csv(file_path, usecols=lambda c: c in USECOLS, dtype=DTYPES, dtype_backend='pyarrow')
+
+def read_alert_data(file_path):
+    """Read the alert rows with Min_Available > 0, via a Parquet copy in .cache/ while the CSV's mtime and size are unchanged"""
+    stat = os.stat(file_path)
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(file_path)), '.cache')
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    cache_path = os.path.join(cache_dir, f"{name}-{stat.st_mtime_ns}-{stat.st_size}.parquet")
+    if os.path.exists(cache_path):
+        # The filter is pushed into the Parquet scan, so rows without availability are never materialized
+        return pd.read_parquet(cache_path, filters=[('Min_Available', '>', 0)])
+
+    df = _read_csv(file_path)
+    if 'Min_Available' not in df.columns:
+        raise KeyError("Expected column 'Min_Available' not found in CSV")
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Drop copies of older versions of this file
+        for stale in glob.glob(os.path.join(cache_dir, f"{glob.escape(name)}-*.parquet")):
+            os.remove(stale)
+        tmp_path = cache_path + '.tmp'
+        df.to_parquet(tmp_path, compression='zstd', index=False)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return df[df['Min_Available'] > 0].reset_index(drop=True)
+
 class MailjetEmailService:
     def __init__(self):
         """Initialize Mailjet client with credentials from .env file"""
@@ -24,36 +62,27 @@ class MailjetEmailService:
     def process_data_file(self, file_path='data/minimum_availability_per_order.csv'):
         """Read minimum_availability_per_order.csv and return rows with Min_Available > 0"""
         try:
-            df = pd.read_csv(file_path)
-            self.logger.info("Loaded %d records from %s", len(df), file_path)
-            if 'Min_Available' not in df.columns:
-                raise KeyError("Expected column 'Min_Available' not found in CSV")
-
-            # Clean PropertyType values -> show "None" for N/A/null/blank
-            if 'PropertyType' in df.columns:
-                df['PropertyType'] = df['PropertyType'].fillna('None').astype(str)
-                df['PropertyType'] = df['PropertyType'].replace(['N/A','n/a','NA','na','',' ','nan','NaN','null','NULL'], 'None')
-
-            # Filter rows where minimum availability > 0
-            filtered_df = df[df['Min_Available'] > 0].copy()
-            self.logger.info("Filtered to %d records with Min_Available > 0", len(filtered_df))
+            # Only rows where minimum availability > 0 are read
+            filtered_df = read_alert_data(file_path)
+            self.logger.info("Loaded %d records with Min_Available > 0 from %s", len(filtered_df), file_path)
             if filtered_df.empty:
                 return pd.DataFrame()
 
-            # Map BedType to user-friendly description
-            def bed_to_desc(bed):
-                if pd.isna(bed):
-                    return 'Unknown'
-                s = str(bed).strip()
-                return {
-                    'Studio': 'Studio',
-                    'Bed1': '1 Bedroom',
-                    'Bed2': '2 Bedroom',
-                    'Bed3': '3 Bedroom',
-                    'Bed4': '4 Bedroom'
-                }.get(s, s)
-
-            filtered_df['RoomTypeDescription'] = filtered_df['BedType'].apply(bed_to_desc)
+            # Clean PropertyType values -> show "None" for N/A/null/blank
+            if 'PropertyType' in filtered_df.columns:
+                filtered_df['PropertyType'] = filtered_df['PropertyType'].fillna('None').astype(str)
+                filtered_df['PropertyType'] = filtered_df['PropertyType'].replace(['N/A','n/a','NA','na','',' ','nan','NaN','null','NULL'], 'None')
+
+            # Map BedType to user-friendly description (unmapped values pass through, missing -> Unknown)
+            bed_desc = {
+                'Studio': 'Studio',
+                'Bed1': '1 Bedroom',
+                'Bed2': '2 Bedroom',
+                'Bed3': '3 Bedroom',
+                'Bed4': '4 Bedroom'
+            }
+            bed = filtered_df['BedType'].astype('string').str.strip()
+            filtered_df['RoomTypeDescription'] = bed.map(bed_desc).fillna(bed).fillna('Unknown')
 
             # Rename Min_Available -> InventoryCount
             filtered_df = filtered_df.rename(columns={'Min_Available': 'InventoryCount'})
@@ -65,9 +94,7 @@ class MailjetEmailService:
                 filtered_df['Vendor'] = filtered_df['Vendor'].fillna('Wyndham')
 
             # Ensure RoomType column exists (minimum file uses 'RoomType')
-            if 'RoomType' not in filtered_df.columns and 'RoomType' in df.columns:
-                filtered_df['RoomType'] = filtered_df['RoomType']
-            elif 'RoomType' not in filtered_df.columns:
+            if 'RoomType' not in filtered_df.columns:
                 filtered_df['RoomType'] = ''
 
             # Select and reorder columns using lists (no sets)
@@ -86,6 +113,11 @@ class MailjetEmailService:
             cols_existing = [c for c in cols if c in filtered_df.columns]
             result_df = filtered_df[cols_existing].copy()
 
+            # Low-cardinality text columns -> category (codes + small lookup) for the email build
+            for c in ('Vendor', 'Resort', 'PropertyType', 'RoomType', 'BedType'):
+                if c in result_df.columns:
+                    result_df[c] = result_df[c].astype('category')
+
             # Add a Status column for compatibility
             result_df['Status'] = 'Available'
 
@@ -106,11 +138,10 @@ class MailjetEmailService:
         avg_inventory = filtered_data['InventoryCount'].mean()
         max_inventory = filtered_data['InventoryCount'].max()
 
-        def fmt_date(d):
-            try:
-                return pd.to_datetime(d).strftime('%Y-%m-%d')
-            except:
-                return str(d)
+        def fmt_dates(dates):
+            """Format a date column in one pass; unparseable values keep their original text"""
+            parsed = pd.to_datetime(dates, errors='coerce', format='mixed')
+            return parsed.dt.strftime('%Y-%m-%d').fillna(dates)
 
         now_et = datetime.now(pytz.timezone('US/Eastern')).strftime('%Y-%m-%d %H:%M:%S (ET)')
 
@@ -129,25 +160,37 @@ class MailjetEmailService:
 
         text = f"RESORT MINIMUM AVAILABILITY ALERT (Min Available > 0)\nReport time: {now_et}\n\n"
 
-        for _, r in filtered_data.iterrows():
-            prop = r.get('PropertyType', 'None') or 'None'
-            arrival = fmt_date(r.get('Arrival', ''))
-            departure = fmt_date(r.get('Departure', ''))
-            html += f"<tr><td>{r.get('Vendor')}</td><td>{r.get('Resort')}</td><td>{arrival}</td><td>{departure}</td>"
-            html += f"<td>{prop}</td><td>{r.get('RoomType','')}</td><td>{r.get('BedType','')}</td>"
-            html += f"<td><strong>{int(r.get('InventoryCount',0))}</strong></td><td>Available</td></tr>"
-
-            text += (
-                f"Vendor: {r.get('Vendor')}\nResort: {r.get('Resort')}\n"
-                f"Arrival: {arrival}\nDeparture: {departure}\n"
-                f"PropertyType: {prop}\nRoomType: {r.get('RoomType','')}\n"
-                f"BedType: {r.get('BedType','')}\nMin Availability: {int(r.get('InventoryCount',0))}\n\n"
-            )
-
-        html += "</tbody></table><p>This is an automated report.</p></body></html>"
-        text += "\nThis is an automated report."
-
-        return html, text
+        def column(name, default=''):
+            """Column as display strings, or a constant column when it is missing"""
+            if name in filtered_data.columns:
+                return filtered_data[name].astype(str).fillna('nan')
+            return pd.Series(default, index=filtered_data.index, dtype=object)
+
+        # Build every row with column-wise string ops instead of iterating rows
+        vendor = column('Vendor', 'None')
+        resort = column('Resort', 'None')
+        prop = column('PropertyType', 'None').replace('', 'None')
+        room_type = column('RoomType')
+        bed_type = column('BedType')
+        arrival = fmt_dates(column('Arrival'))
+        departure = fmt_dates(column('Departure'))
+        inventory = filtered_data['InventoryCount'].fillna(0).astype('int64').astype(str)
+
+        html_rows = (
+            "<tr><td>" + vendor + "</td><td>" + resort + "</td><td>" + arrival + "</td><td>" + departure + "</td>"
+            + "<td>" + prop + "</td><td>" + room_type + "</td><td>" + bed_type + "</td>"
+            + "<td><strong>" + inventory + "</strong></td><td>Available</td></tr>"
+        )
+        text_rows = (
+            "Vendor: " + vendor + "\nResort: " + resort + "\n"
+            + "Arrival: " + arrival + "\nDeparture: " + departure + "\n"
+            + "PropertyType: " + prop + "\nRoomType: " + room_type + "\n"
+            + "BedType: " + bed_type + "\nMin Availability: " + inventory + "\n\n"
+        )
+        html_parts = [html, *html_rows.tolist(), "</tbody></table><p>This is an automated report.</p></body></html>"]
+        text_parts = [text, *text_rows.tolist(), "\nThis is an automated report."]
+
+        return ''.join(html_parts), ''.join(text_parts)
 
     def send_email_to_multiple(self, recipient_emails, subject=None, html_content=None, text_content=None):
         """Send email via Mailjet"""
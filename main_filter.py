@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import os
 from datetime import datetime, timedelta
@@ -165,11 +166,16 @@ def map_orders_to_blackout_data():
         if col in blackout_df.columns:
             blackout_df[col] = blackout_df[col].astype(bool)
     
+    # Resolve each order's bed type up front: first flagged column wins, None when no flag is set
+    bed_columns = ['Studio', 'Bed1', 'Bed2', 'Bed3', 'Bed4']
+    bed_flags = [(orders_df[col] == True) | (orders_df[col].astype(str).str.lower() == 'true') for col in bed_columns]
+    bed_types = np.select(bed_flags, bed_columns, default=None).tolist()
+    
     # Prepare results list
     results = []
     
     # Process each order
-    for idx, order in orders_df.iterrows():
+    for (idx, order), bed_type in zip(orders_df.iterrows(), bed_types):
         # Calculate date range (arrival to departure-1) - FIXED LOGIC
         start_date = order['Arrival']
         end_date = order['Departure'] - timedelta(days=1)
@@ -183,17 +189,6 @@ def map_orders_to_blackout_data():
             # Create date range
             date_range = pd.date_range(start=start_date, end=end_date, freq='D')
             
-            # Extract bed type information
-            bed_columns = ['Studio', 'Bed1', 'Bed2', 'Bed3', 'Bed4']
-            bed_type = None
-            bed_value = None
-            
-            for col in bed_columns:
-                if order[col] == True or str(order[col]).lower() == 'true':
-                    bed_type = col
-                    bed_value = True
-                    break
-            
             # Debug print for first order
             if idx == 0:
                 print(f"First order bed type: {bed_type}")